@@ -32,8 +32,8 @@ USAGE:
         max_val:    (default 255) Maps this value to the highest colormap color
         cmap_name:  (default 'viridis') [string] One of the colormap names 
                     cmap.names_all is an array with all the valid names
-        num_colors: (default 256) Determines the length of cmap.colormap_array, an
-                    array of (r,g,b) tuples where cmap.colomap_array[0] corresponds
+        num_colors: (default 256) Determines the length of cmap.colormap_array, a
+                    NumPy array of (r,g,b) rows where cmap.colomap_array[0] corresponds
                     to the min_val/lowest color and cmap.colomap_array[num_colors-1]
                     corresponds to the max_val/highest color in the colomap
         array_type: (default 'rgb_u8') [string] One of the following values: 
@@ -46,7 +46,11 @@ USAGE:
                                 np.float64s with values in [0.0, 1.0]
                     'rgba_f'  - For colors in the form (r, g, b, a) where r,g,b, and a are
                                 np.float64s with values in [0.0, 1.0]
-                    This parameter is used to fill cmap.colormap_array
+                    This parameter is used to fill cmap.colormap_array. For 'rgb_u8'
+                    it has dtype np.uint8. For 'rgba_u8' the whole array is np.float64
+                    so that it can also hold the alpha value a, which means its r, g,
+                    and b values are whole-number floats (e.g. 68.0) rather than ints.
+                    The `get_rgba_u8()` method still returns ints.
     
     cmap.cycle_colormap() 
         Cycles cmap.cmap_name through one of these values:
@@ -56,7 +60,8 @@ USAGE:
         cycle through different values, add them to or remove them from 
             self.names_to_cycle
         defined in __init__ below. Any of the names in cmap.names_all can be used to set
-        a new colormap name via `cmap.set_colormap_name('your_favorite_name')`
+        a new colormap name via `cmap.set_colormap_name('your_favorite_name')`; any other
+        name raises a ValueError right away
     
     r, g, b = cmap.get_rgb_f(some_scalar_value)
         When given some_scalar_value (with min_val <= some_scalar_value <= max_val) the
@@ -68,14 +73,31 @@ USAGE:
         unisgned integers or floats, respectively, of the colormap value along with a as an
         np.float64, provided that we have 0 <= some_int < `cmap.num_colors`. If the 
         `array_type` is 'rgb_u8' or 'rgb_f', this will give you a ValueError because the 
-        array cmap.colormap_array is an array of (r,g,b) tuples, not (r,g,b,a). 
+        array cmap.colormap_array is an array of (r,g,b) rows, not (r,g,b,a). 
     
     r, g, b = cmap.colormap_array[some_int]
         If the `array_type` is 'rgb_u8' or 'rgb_f' then this will assign r,g, and b to be
         unisgned integers or floats, respectively, of the colormap value, provided that we 
         have 0 <= some_int < `cmap.num_colors`. If the `array_type` is 'rgba_u8' or 'rgba_f', 
         this will give you a ValueError because the array cmap.colormap_array is an array of 
-        (r,g,b,a) tuples, not (r,g,b).  
+        (r,g,b,a) rows, not (r,g,b).  
+    
+    cmap.lut_u32
+        The colors in cmap.colormap_array packed into one np.uint32 each, with red, green,
+        and blue shifted left by cmap.lut_shifts (by default (16, 8, 0), i.e. 0x00RRGGBB).
+        This is the form pygame.surfarray.blit_array() wants, so an image of colormap
+        indices `idx` can be drawn with `blit_array(surface, cmap.lut_u32.take(idx))`.
+        It is kept up to date automatically, including when you assign a new array to
+        cmap.colormap_array; if you change entries of cmap.colormap_array in place,
+        call `cmap.pack_lut_u32()` afterwards.
+    
+    The setters (and cmap.cycle_colormap()) don't rebuild anything themselves; the
+    colormap is rebuilt once, the next time cmap.colormap_array, cmap.lut_u32, or one of
+    the `get_rgbX_Y()` methods is used. So calling several setters in a row is cheap.
+    
+    cmap.set_lut_shifts(r_shift, g_shift, b_shift)
+        Changes the bit positions used in cmap.lut_u32, e.g. to match a pygame surface
+        with `cmap.set_lut_shifts(*surface.get_shifts()[:3])`.
     
 """
     def __init__(self, min_val=0, max_val=255, cmap_name='viridis', num_colors=256, array_type='rgb_u8'):
@@ -87,8 +109,12 @@ USAGE:
         self.min_value = min_val
         self.max_value = max_val
         self.number_colors = num_colors
-        self.colormap_array = []
         self.array_type = array_type
+        # Builds colormap_array for each array_type from an array of values
+        self._builders = {'rgb_u8': self._build_rgb_u8, 'rgba_u8': self._build_rgba_u8,
+                          'rgb_f': self._build_rgb_f, 'rgba_f': self._build_rgba_f}
+        self._builder = self._builders[array_type]
+        self.lut_shifts = (16, 8, 0)
         self.initialize()
 
 
@@ -99,41 +125,95 @@ USAGE:
         # In other versions of the same class, the following is removed, but 
         # it made sense to use in mandelbrot.py. See NOTE in docstring.
         vals = np.linspace(self.min_value, self.max_value, self.number_colors)
-        self.colormap_array = []
-        for v in vals:
-            if self.array_type == 'rgb_u8':
-                self.colormap_array.append(self.get_rgb_u8(v))
-            elif self.array_type == 'rgba_u8':
-                self.colormap_array.append(self.get_rgba_u8(v))
-            elif self.array_type == 'rgb_f':
-                self.colormap_array.append(self.get_rgb_f(v))
-            elif self.array_type == 'rgba_f':
-                self.colormap_array.append(self.get_rgba_f(v))
+        self._colormap_array = self._builder(vals)
+        self.pack_lut_u32()
+        # Only up to date once everything above has worked
+        self._dirty = False
+
+    # Each of these looks up all the colors with a single call (to_rgba() gives
+    # an (n, 4) array of rgba floats in [0, 1]) and converts them to array_type.
+    def _build_rgb_u8(self, vals):
+        return np.round(255*self.scalarMap.to_rgba(vals)[:,:3]).astype(np.uint8)
+
+    def _build_rgba_u8(self, vals):
+        rgba = self.scalarMap.to_rgba(vals)
+        u8 = np.round(255*rgba[:,:3]).astype(np.uint8)
+        return np.concatenate([u8, rgba[:,3:4]], axis=1)
+
+    def _build_rgb_f(self, vals):
+        return self.scalarMap.to_rgba(vals)[:,:3].astype(np.float64)
+
+    def _build_rgba_f(self, vals):
+        return self.scalarMap.to_rgba(vals)
+
+    # The setters only mark the colormap as out of date (so changing several
+    # things in a row doesn't rebuild it every time); it's rebuilt the next
+    # time something actually needs it.
+    def _ensure(self):
+        if self._dirty:
+            self.initialize()
+
+    @property
+    def colormap_array(self):
+        self._ensure()
+        return self._colormap_array
+
+    # Assigning a whole new array replaces the colors until the next setter
+    # call or cycle_colormap(); lut_u32 is repacked to match.
+    @colormap_array.setter
+    def colormap_array(self, arr):
+        self._ensure()
+        self._colormap_array = arr
+        self.pack_lut_u32()
+
+    @property
+    def lut_u32(self):
+        self._ensure()
+        return self._lut_u32
+
+    def pack_lut_u32(self):
+        rgb = np.asarray(self._colormap_array)[:,:3]
+        if self.array_type in ('rgb_f', 'rgba_f'):
+            rgb = np.round(255*rgb)
+        rgb = rgb.astype(np.uint32)
+        r_shift, g_shift, b_shift = self.lut_shifts
+        self._lut_u32 = (rgb[:,0] << r_shift) | (rgb[:,1] << g_shift) | (rgb[:,2] << b_shift)
+
+    def set_lut_shifts(self, r_shift, g_shift, b_shift):
+        self.lut_shifts = (r_shift, g_shift, b_shift)
+        if not self._dirty:
+            self.pack_lut_u32()
 
     def cycle_colormap(self):
         self.current_cycle_number += 1
         self.current_cycle_number %= len(self.names_to_cycle)
         self.cmap_name = self.names_to_cycle[self.current_cycle_number]
-        self.initialize()
+        self._dirty = True
 
     def set_min_max_vals(self, min_val, max_val):
         self.min_value = min_val
         self.max_value = max_val
-        self.initialize()
+        self._dirty = True
 
     def set_colormap_name(self, name):
+        if name not in self.names_all:
+            raise ValueError("%r is not a colormap name (see cmap.names_all)" % (name,))
         self.cmap_name = name
-        self.initialize()
+        self._dirty = True
 
     def set_array_type(self, ar_type):
+        if ar_type not in self._builders:
+            raise ValueError("%r is not one of the array types %s" % (ar_type, list(self._builders)))
         self.array_type = ar_type
-        self.initialize()
+        self._builder = self._builders[ar_type]
+        self._dirty = True
 
     def set_number_colors(self, num_cols):
         self.number_colors = num_cols
-        self.initialize()
+        self._dirty = True
 
     def get_rgb_u8(self, val):
+        self._ensure()
         c = self.scalarMap.to_rgba(val)
         # c = (r, g, b, a) each a float in [0, 1]
         # convert to ints in [0, 255]
@@ -143,6 +223,7 @@ USAGE:
         return (red, green, blue)
 
     def get_rgba_u8(self, val):
+        self._ensure()
         c = self.scalarMap.to_rgba(val)
         # c = (r, g, b, a) each a float in [0, 1]
         # convert to ints in [0, 255]
@@ -152,8 +233,10 @@ USAGE:
         return (red, green, blue, c[3])
 
     def get_rgb_f(self, val):
+        self._ensure()
         c = self.scalarMap.to_rgba(val)
         return (c[0], c[1], c[2])
 
     def get_rgba_f(self, val):
+        self._ensure()
         return self.scalarMap.to_rgba(val)
@@ -0,0 +1,146 @@
+/*
+ * mandel.c
+ *
+ * Hand-vectorized version of the escape-time loop in mandelbrot.py. Each column
+ * of the image (one cx against every cy) is done 8 points at a time with
+ * AVX-512, or 4 at a time with AVX2, keeping a mask of the points that haven't
+ * blown up yet. Points left over at the end of a column, or every point on a
+ * CPU without either, go through the plain scalar loop.
+ *
+ * Build it with
+ *
+ *      $ gcc -O3 -march=native -fopenmp -shared -fPIC mandel.c -o libmandel.so
+ *
+ * and mandelbrot.py will pick it up (through ctypes) the next time it starts.
+ * The counts are the ones _escape_time() in mandelbrot.py gives (give or take
+ * rounding for points right on the edge of the set).
+ */
+
+#include <stdint.h>
+#include <stddef.h>
+#include <immintrin.h>
+
+/* Points inside the main cardioid or the period-2 bulb are in the set */
+static int in_bulbs(double cx, double cy)
+{
+    double xq = cx - 0.25;
+    double q = xq*xq + cy*cy;
+    return q*(q + xq) <= 0.25*cy*cy || (cx + 1.0)*(cx + 1.0) + cy*cy <= 0.0625;
+}
+
+static int32_t escape_time(double cx, double cy, int max_itr)
+{
+    double x = 0.0, y = 0.0, x2, y2;
+    int itr = 0;
+
+    if (in_bulbs(cx, cy))
+        return max_itr - 1;
+    while (itr < max_itr - 1) {
+        x2 = x*x;
+        y2 = y*y;
+        if (x2 + y2 > 4.0)
+            break;
+        y = 2.0*x*y + cy;
+        x = x2 - y2 + cx;
+        itr++;
+    }
+    return itr;
+}
+
+#if defined(__AVX512F__)
+
+#define LANES 8
+
+static void column_simd(double cx, const double *cy, int32_t *out, int max_itr)
+{
+    const __m512d one = _mm512_set1_pd(1.0);
+    const __m512d four = _mm512_set1_pd(4.0);
+    const __m512d vcx = _mm512_set1_pd(cx);
+    __m512d vcy = _mm512_loadu_pd(cy);
+    __m512d vx = _mm512_setzero_pd();
+    __m512d vy = _mm512_setzero_pd();
+    __m512d vx2, vy2, counts;
+    __mmask8 active = 0;
+    int k, itr;
+
+    /* Points in the bulbs start out finished, with the full count */
+    for (k = 0; k < LANES; k++)
+        if (!in_bulbs(cx, cy[k]))
+            active |= (__mmask8)(1 << k);
+    counts = _mm512_mask_blend_pd(active, _mm512_set1_pd(max_itr - 1), _mm512_setzero_pd());
+
+    for (itr = 0; itr < max_itr - 1; itr++) {
+        vx2 = _mm512_mul_pd(vx, vx);
+        vy2 = _mm512_mul_pd(vy, vy);
+        active = _mm512_mask_cmp_pd_mask(active, _mm512_add_pd(vx2, vy2), four, _CMP_LE_OQ);
+        if (!active)
+            break;
+        counts = _mm512_mask_add_pd(counts, active, counts, one);
+        vy = _mm512_fmadd_pd(_mm512_add_pd(vx, vx), vy, vcy);
+        vx = _mm512_add_pd(_mm512_sub_pd(vx2, vy2), vcx);
+    }
+    _mm256_storeu_si256((__m256i *)out, _mm512_cvtpd_epi32(counts));
+}
+
+#elif defined(__AVX2__) && defined(__FMA__)
+
+#define LANES 4
+
+static void column_simd(double cx, const double *cy, int32_t *out, int max_itr)
+{
+    const __m256d one = _mm256_set1_pd(1.0);
+    const __m256d four = _mm256_set1_pd(4.0);
+    const __m256d vcx = _mm256_set1_pd(cx);
+    __m256d vcy = _mm256_loadu_pd(cy);
+    __m256d vx = _mm256_setzero_pd();
+    __m256d vy = _mm256_setzero_pd();
+    __m256d vx2, vy2, counts, active;
+    double start[LANES], alive[LANES];
+    int k, itr;
+
+    /* Points in the bulbs start out finished, with the full count */
+    for (k = 0; k < LANES; k++) {
+        int inside = in_bulbs(cx, cy[k]);
+        start[k] = inside ? max_itr - 1 : 0.0;
+        alive[k] = inside ? 0.0 : -1.0;     /* sign bit set means active */
+    }
+    counts = _mm256_loadu_pd(start);
+    active = _mm256_cmp_pd(_mm256_loadu_pd(alive), _mm256_setzero_pd(), _CMP_LT_OQ);
+
+    for (itr = 0; itr < max_itr - 1; itr++) {
+        vx2 = _mm256_mul_pd(vx, vx);
+        vy2 = _mm256_mul_pd(vy, vy);
+        active = _mm256_and_pd(active, _mm256_cmp_pd(_mm256_add_pd(vx2, vy2), four, _CMP_LE_OQ));
+        if (!_mm256_movemask_pd(active))
+            break;
+        counts = _mm256_add_pd(counts, _mm256_and_pd(active, one));
+        vy = _mm256_fmadd_pd(_mm256_add_pd(vx, vx), vy, vcy);
+        vx = _mm256_add_pd(_mm256_sub_pd(vx2, vy2), vcx);
+    }
+    _mm_storeu_si128((__m128i *)out, _mm256_cvtpd_epi32(counts));
+}
+
+#endif
+
+/* Fills out[0..n) with the counts for cx + i*cy[j], j = 0..n-1 */
+void mandel_column(double cx, const double *cy, int n, int max_itr, int32_t *out)
+{
+    int j = 0;
+
+#ifdef LANES
+    for (; j + LANES <= n; j += LANES)
+        column_simd(cx, cy + j, out + j, max_itr);
+#endif
+    for (; j < n; j++)
+        out[j] = escape_time(cx, cy[j], max_itr);
+}
+
+/* Fills the nx by ny array out (C order, like px_arr) one column per thread */
+void mandel_grid(const double *cx, int nx, const double *cy, int ny, int max_itr, int32_t *out)
+{
+    int i;
+
+    #pragma omp parallel for schedule(dynamic)
+    for (i = 0; i < nx; i++)
+        mandel_column(cx[i], cy, ny, max_itr, out + (size_t)i*ny);
+}
@@ -0,0 +1,80 @@
+# distutils: extra_compile_args = -O3 -march=native -ffast-math -fopenmp
+# distutils: extra_link_args = -fopenmp
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+mandel_cy.pyx
+
+Cython version of the escape-time loop in mandelbrot.py. Build it with
+
+      `$ cythonize -i mandel_cy.pyx`
+
+and mandelbrot.py will import it the next time it starts. It works with both
+float32 and float64 values, the same as the numba kernel.
+"""
+
+from cython.parallel import prange
+
+ctypedef fused real:
+    float
+    double
+
+
+# Same as _escape_time() in mandelbrot.py, with the loop unrolled by hand so
+# that it does four steps (each still checking whether z has blown up) per
+# trip around the loop. Keeping the squares from one step to the next means
+# each step is three multiplications and a handful of adds.
+cdef inline int escape(real cx, real cy, int max_itr) noexcept nogil:
+    cdef real x = 0, y = 0, x2 = 0, y2 = 0
+    cdef real xq = cx - 0.25
+    cdef real q = xq*xq + cy*cy
+    cdef int itr = 0
+
+    # Points in the main cardioid or the period-2 bulb are in the set
+    if q*(q + xq) <= 0.25*cy*cy or (cx + 1)*(cx + 1) + cy*cy <= 0.0625:
+        return max_itr - 1
+
+    while itr + 4 <= max_itr - 1:
+        if x2 + y2 > 4:
+            return itr
+        y = (x + x)*y + cy
+        x = x2 - y2 + cx
+        x2 = x*x
+        y2 = y*y
+        if x2 + y2 > 4:
+            return itr + 1
+        y = (x + x)*y + cy
+        x = x2 - y2 + cx
+        x2 = x*x
+        y2 = y*y
+        if x2 + y2 > 4:
+            return itr + 2
+        y = (x + x)*y + cy
+        x = x2 - y2 + cx
+        x2 = x*x
+        y2 = y*y
+        if x2 + y2 > 4:
+            return itr + 3
+        y = (x + x)*y + cy
+        x = x2 - y2 + cx
+        x2 = x*x
+        y2 = y*y
+        itr += 4
+
+    # Fewer than four steps left
+    while itr < max_itr - 1:
+        if x2 + y2 > 4:
+            break
+        y = (x + x)*y + cy
+        x = x2 - y2 + cx
+        x2 = x*x
+        y2 = y*y
+        itr += 1
+    return itr
+
+
+# Fills out (shaped like px_arr, len(rv) by len(iv)) one column per thread
+def calculate(real[::1] rv, real[::1] iv, int max_itr, int[:, ::1] out):
+    cdef Py_ssize_t i, j
+    for i in prange(rv.shape[0], nogil=True, schedule='dynamic'):
+        for j in range(iv.shape[0]):
+            out[i, j] = escape(rv[i], iv[j], max_itr)
@@ -1,5 +1,34 @@
+import os
+import ctypes
+import threading
 import pygame
 import numpy as np
+try:
+    from numba import njit, guvectorize, float32, float64, int64, int32, cuda
+    have_numba = True
+except ImportError:
+    # Fall back on the (slower) vectorized NumPy kernel below
+    have_numba = False
+# With an NVIDIA GPU (and the CUDA toolkit) every pixel gets its own GPU thread
+have_cuda = have_numba and cuda.is_available()
+# numexpr can evaluate the NumPy kernel's steps (see use_numexpr below)
+try:
+    import numexpr as ne
+    have_numexpr = True
+except ImportError:
+    have_numexpr = False
+# The hand-vectorized C kernel in mandel.c, if it has been built (see README)
+try:
+    _libmandel = np.ctypeslib.load_library('libmandel', os.path.dirname(os.path.abspath(__file__)))
+    have_simd = True
+except OSError:
+    have_simd = False
+# The Cython kernel in mandel_cy.pyx, if it has been built (see README)
+try:
+    import mandel_cy
+    have_cython = True
+except ImportError:
+    have_cython = False
 from colormap import ColorMap
 
 """
@@ -25,8 +54,9 @@ KEYBOARD COMMANDS:
 
 MOUSE INTERACTION:
     To zoom in on a region, click on the upper-left-hand corner of the region and 
-    drag to the lower right corner of the region and release the mouse button. It may
-    take time to recalculate before refreshing. Note that the region may not be exactly
+    drag to the lower right corner of the region and release the mouse button. A blocky,
+    enlarged copy of the region is shown right away while the new one is calculated;
+    it may take time before the sharp version replaces it. Note that the region may not be exactly
     what you selected because the y-values (vertical) are changed to preserve the
     aspect ratio of the complex plane with respect to the viewing window.
 """
@@ -49,23 +79,54 @@ real_max = 1.0      # upper horizontal bound
 imag_max = num_y *(real_max - real_min) / (2.0 * num_x)
 imag_min = -imag_max
 
-# Values used for plotting points on complex plane
-real_values = np.linspace(real_min, real_max, num_x)
-imag_values = np.linspace(imag_max, imag_min, num_y)
-
-# Used for coloring points
+# plot_values()
+#
+# Values used for plotting points on complex plane. These are float64, except
+# for the two kernels that actually get faster in float32: the NumPy one (which
+# streams whole arrays through memory, so half the bytes matters) and the GPU
+# one (GPUs do float32 much faster than float64). The other kernels keep each
+# point in registers and run just as fast either way, so they'd only lose
+# accuracy. Even for NumPy and CUDA we switch to float64 once a pixel is less
+# than about 1e-6 wide, since past that float32 can barely tell neighbouring
+# pixels apart. The kernels pick the version to run from the dtype.
+use_float32 = have_cuda or not (have_simd or have_cython or have_numba)
+
+def plot_values():
+    if not use_float32 or (real_max - real_min)/num_x < 1e-6:
+        dtype = np.float64
+    else:
+        dtype = np.float32
+    return (np.linspace(real_min, real_max, num_x, dtype=dtype),
+            np.linspace(imag_max, imag_min, num_y, dtype=dtype))
+
+
+real_values, imag_values = plot_values()
+
+# Used for coloring points. Its packed colors (cmap.lut_u32) are laid out the
+# way the window stores its pixels, so they can be copied straight in.
 cmap = ColorMap(0, 255, 'viridis')
+cmap.set_lut_shifts(*window.get_shifts()[:3])
 
 # Used to toggle whether the set is colored black, 
 # or the final color in the colormap 
 set_black = False
 
-# This can be changed by initializing/changing cmap 
-# cmap.num_colors defaults to 256
-max_itr = cmap.number_colors
+# iteration_budget()
+#
+# How many times to iterate before deciding a point is in the set. The
+# further we zoom in, the more iterations it takes to tell points near the
+# edge of the set apart, so this grows with the zoom depth: 50 for the
+# starting view, plus 200 more for every factor of 10 we've zoomed in.
+def iteration_budget():
+    width = real_max - real_min
+    if not width > 0:
+        # Shouldn't happen (on_mouse_up() ignores empty boxes), but don't
+        # let log10 of zero or a negative width turn into inf or nan
+        return 50
+    return int(50 + 200*max(0.0, -np.log10(width/3.0)))
+
 
-# Used to store number of iterations for each point 
-px_arr = np.zeros((num_x,num_y))
+max_itr = iteration_budget()
 
 
 # calculate_mandelbrot()
@@ -99,27 +160,251 @@ px_arr = np.zeros((num_x,num_y))
 #
 # y = 2*x*y + cy
 #
-def calculate_mandelbrot():
-    for i in range(len(real_values)):
-        for j in range(len(imag_values)):
-            # At the i,jth pixel, get the corresponding complex number cz = cz + i*cy
-            cx = real_values[i]
-            cy = imag_values[j]
-            itr = 0
-            x = 0
-            y = 0
-            while itr < max_itr-1 and x*x + y*y <= 4:
-                # This loop stops when the magnitude x^2+y^2 gets too big,
-                # or we reach max_itr, the maximum number of iterations
-                itr += 1
-                newx = x*x - y*y + cx  # Use "newx" so we don't overwrite the old x value needed
-                y = 2*x*y + cy         # <--- here.
-                x = newx               # Now we can assign it to "x" because y is assigned
-            px_arr[i,j] = itr # record the number of iterations it took for the loop to stop
-
-
-# Call it here so it's ready to draw below
-calculate_mandelbrot()
+# _escape_time() does that for a single point. Every pixel is independent of
+# every other one, so _mandelbrot_row() is a generalized ufunc that fills one
+# column of the image (a fixed cx against every cy) and numba hands the columns
+# out to all the CPU cores. Numba compiles the whole thing to machine code.
+#
+if have_numba:
+    @njit(fastmath=True, cache=True)
+    def _escape_time(cx, cy, max_itr):
+        # Points inside the main cardioid or the big circle to its left (the
+        # period-2 bulb) are known to be in the set, so don't bother iterating.
+        xq = cx - 0.25
+        q = xq*xq + cy*cy
+        if q*(q + xq) <= 0.25*cy*cy or (cx + 1.0)*(cx + 1.0) + cy*cy <= 0.0625:
+            return max_itr-1
+        # z starts at 0, so the first step always gives z = c. Starting from
+        # there (rather than from 0.0, a float64) also keeps x and y the same
+        # type as cx and cy, so float32 values stay float32 all the way through.
+        itr = 1
+        x = cx
+        y = cy
+        while itr < max_itr-1:
+            # This loop stops when the magnitude x^2+y^2 gets too big,
+            # or we reach max_itr, the maximum number of iterations.
+            # The squares are computed once and used for both the
+            # magnitude test and the update.
+            x2 = x*x
+            y2 = y*y
+            if x2 + y2 > 4.0:
+                break
+            y = (x + x)*y + cy     # y goes first since it needs the old x...
+            x = x2 - y2 + cx       # ...and x only needs the old squares
+            itr += 1
+        return itr # the number of iterations it took for the loop to stop
+
+    @guvectorize([(float32, float32[:], int64, int32[:]),
+                  (float64, float64[:], int64, int32[:])], '(),(m),()->(m)',
+                 target='parallel', nopython=True, fastmath=True)
+    def _mandelbrot_row(cx, iv, max_itr, out):
+        for j in range(iv.shape[0]):
+            out[j] = _escape_time(cx, iv[j], max_itr)
+
+# On the GPU the same _escape_time() is compiled as a device function and each
+# thread does one pixel. The result is written to a GPU array and copied back
+# to the host when the kernel is done.
+if have_cuda:
+    _escape_time_gpu = cuda.jit(device=True, fastmath=True)(_escape_time.py_func)
+
+    @cuda.jit(fastmath=True)
+    def _mandelbrot_cuda(rv, iv, max_itr, out):
+        i, j = cuda.grid(2)
+        if i < rv.shape[0] and j < iv.shape[0]:
+            out[i,j] = _escape_time_gpu(rv[i], iv[j], max_itr)
+
+
+# Without numba we do the same thing for a whole block of pixels at once. x and
+# y hold the current z for every point in the block that hasn't blown up yet,
+# and each NumPy call runs in C instead of the interpreter. Everything is done
+# in the dtype of rv and iv (see plot_values()).
+#
+# Testing the magnitude after every single step costs about as much as the step
+# itself, so the points are iterated check_every times without looking and only
+# then tested. Once |z| > 2 it only keeps growing, so anything that is past 4 at
+# the end of a batch escaped somewhere inside it; those few points are replayed
+# step by step from the start of the batch to get their exact count, and then
+# dropped so later batches only work on the points that are left. When none are
+# left the tile is done early, which is most of the time for tiles outside the set.
+# (Escaped points can overflow to inf/nan within a batch, hence the errstate and
+# testing for "not <= 4" rather than "> 4".)
+#
+# With use_numexpr set (and numexpr installed) numexpr evaluates each step
+# instead. It's off by default because on tiles this size its per-call overhead
+# outweighs what it saves: on a single core it was about twice as slow as plain
+# NumPy. It may be worth turning on for bigger tiles on a machine with many cores.
+#
+# Doing the image one tile at a time also keeps all of these arrays small enough
+# to stay in the CPU cache for all max_itr passes, while each NumPy call still
+# has enough points to make the call worth it.
+tile_size = 256
+check_every = 8
+use_numexpr = False
+
+def _mandelbrot_numpy_tile(rv, iv, max_itr, out):
+    shape = (rv.shape[0], iv.shape[0])
+    cx = np.broadcast_to(rv[:, None], shape).ravel()
+    cy = np.broadcast_to(iv[None, :], shape).ravel()
+    it = np.full(cx.size, max_itr-1, dtype=np.int32)   # unless they escape below
+    # Points in the main cardioid or the period-2 bulb are in the set (see
+    # _escape_time()), so they're left out from the start
+    xq = cx - 0.25
+    q = xq*xq + cy*cy
+    outside = (q*(q + xq) > 0.25*cy*cy) & ((cx + 1.0)*(cx + 1.0) + cy*cy > 0.0625)
+    idx = np.flatnonzero(outside)   # where each remaining point lives in the tile
+    cx = cx[idx]
+    cy = cy[idx]
+    x = np.zeros_like(cx)
+    y = np.zeros_like(cy)
+    itr = 0
+    with np.errstate(over='ignore', invalid='ignore'):
+        while itr < max_itr-1 and idx.size > 0:
+            steps = min(check_every, max_itr-1 - itr)
+            x0 = x
+            y0 = y
+            if use_numexpr and have_numexpr:
+                for s in range(steps):
+                    x, y = ne.evaluate('x*x - y*y + cx'), ne.evaluate('2*x*y + cy')
+                escaped = ne.evaluate('~(x*x + y*y <= 4)')
+            else:
+                for s in range(steps):
+                    x, y = x*x - y*y + cx, 2*x*y + cy
+                escaped = ~(x*x + y*y <= 4.0)
+            if escaped.any():
+                ex = x0[escaped]
+                ey = y0[escaped]
+                ecx = cx[escaped]
+                ecy = cy[escaped]
+                n = np.full(ex.size, itr, dtype=np.int32)
+                alive = np.ones(ex.size, dtype=bool)
+                for s in range(steps):
+                    alive &= ex*ex + ey*ey <= 4.0
+                    n += alive
+                    ex, ey = ex*ex - ey*ey + ecx, 2*ex*ey + ecy
+                it[idx[escaped]] = n
+                keep = ~escaped
+                x = x[keep]
+                y = y[keep]
+                cx = cx[keep]
+                cy = cy[keep]
+                idx = idx[keep]
+            itr += steps
+    out[:] = it.reshape(shape)
+
+
+def _mandelbrot_numpy(rv, iv, max_itr, out):
+    for i in range(0, rv.shape[0], tile_size):
+        for j in range(0, iv.shape[0], tile_size):
+            _mandelbrot_numpy_tile(rv[i:i+tile_size], iv[j:j+tile_size], max_itr,
+                                   out[i:i+tile_size, j:j+tile_size])
+
+
+# mandel_grid() in mandel.c fills an nx by ny int32 array in place
+if have_simd:
+    _libmandel.mandel_grid.argtypes = [
+        np.ctypeslib.ndpointer(np.float64, ndim=1, flags='C_CONTIGUOUS'), ctypes.c_int,
+        np.ctypeslib.ndpointer(np.float64, ndim=1, flags='C_CONTIGUOUS'), ctypes.c_int,
+        ctypes.c_int,
+        np.ctypeslib.ndpointer(np.int32, ndim=2, flags='C_CONTIGUOUS,WRITEABLE')]
+    _libmandel.mandel_grid.restype = None
+
+
+# Returns the number of iterations for each point of the grid given by
+# real_values and imag_values. It doesn't touch any of the globals the window
+# uses (the output, and on the GPU its device copy, are allocated fresh for
+# each call), so it's safe to run in another thread while the window keeps
+# using the old values.
+#
+# The result is indexed [x,y], the same way pygame.surfarray sees the window,
+# and stored in C order so that each column (fixed x, all the y's) is one
+# contiguous run of memory. All the kernels have y as their innermost loop, so
+# they walk through it one int32 at a time.
+def calculate_mandelbrot(real_values, imag_values, max_itr):
+    num_x = real_values.shape[0]
+    num_y = imag_values.shape[0]
+    out = np.empty((num_x, num_y), dtype=np.int32, order='C')
+    if have_cuda:
+        threads_per_block = (16, 16)
+        blocks_per_grid = ((num_x + 15)//16, (num_y + 15)//16)
+        d_out = cuda.device_array(out.shape, dtype=out.dtype)
+        _mandelbrot_cuda[blocks_per_grid, threads_per_block](real_values, imag_values,
+                                                             max_itr, d_out)
+        d_out.copy_to_host(out)
+    elif have_simd:
+        # mandel.c only works in double precision
+        _libmandel.mandel_grid(real_values.astype(np.float64), num_x,
+                               imag_values.astype(np.float64), num_y, max_itr, out)
+    elif have_cython:
+        mandel_cy.calculate(real_values, imag_values, max_itr, out)
+    elif have_numba:
+        _mandelbrot_row(real_values, imag_values, max_itr, out)
+    else:
+        _mandelbrot_numpy(real_values, imag_values, max_itr, out)
+    return out
+
+
+# zoom_preview()
+#
+# The region we're zooming into is already on the screen, just at a lower
+# resolution. Stretching that part of px_arr out to fill the window (each new
+# pixel takes the value of the nearest old one) gives something to show right
+# away while the real thing is calculated.
+def zoom_preview(x0, y0, width, height):
+    ix = x0 + np.arange(num_x)*width//num_x
+    iy = np.minimum(y0 + np.arange(num_y)*height//num_y, num_y - 1)
+    return px_arr[np.ix_(ix, iy)]
+
+
+# color_indices()
+#
+# Spreads iteration counts in [0, max_itr-1] over the whole colormap, so that
+# points in the set (max_itr-1 iterations) always get the last color.
+def color_indices(counts, max_itr):
+    return (counts.astype(np.int64)*(cmap.number_colors - 1)//(max_itr - 1)).astype(np.int32)
+
+
+# Used to store number of iterations for each point. Call it here so it's
+# ready to draw below (this also warms up the compiled kernel). px_idx is the
+# colormap index for each point.
+px_arr = calculate_mandelbrot(real_values, imag_values, max_itr)
+px_idx = color_indices(px_arr, max_itr)
+
+# After a zoom the new px_arr is calculated in the background so the window
+# keeps responding; pending is the job we're waiting on. All the kernels
+# either release the GIL or spend their time in code that does, so a thread
+# is enough. The new counts replace px_arr only once they're completely
+# filled in, so we never draw a half-finished image.
+#
+# BackgroundJob runs fn(*args) on a daemon thread (so quitting in the middle
+# of a long calculation doesn't have to wait for it to finish) and keeps its
+# result, or the exception it raised, for the main loop to pick up once the
+# thread is no longer alive.
+class BackgroundJob(threading.Thread):
+    def __init__(self, fn, *args):
+        super().__init__(daemon=True)
+        self.fn = fn
+        self.args = args
+        self.result = None
+        self.error = None
+        self.start()
+
+    def run(self):
+        try:
+            self.result = self.fn(*self.args)
+        except Exception as e:
+            self.error = e
+
+
+pending = None
+
+# Shown on top of the zoom preview until the real thing is ready
+font = pygame.font.Font(None, 36)
+computing_text = font.render("computing...", True, (255, 255, 255), (0, 0, 0))
+
+# Set whenever px_arr or the colors change, so that the window is only
+# redrawn when there's actually something new to show
+dirty = True
+clock = pygame.time.Clock()
 
 # Used to recalculate bounds to zoom in
 mouse_down_x = 0
@@ -127,73 +412,147 @@ mouse_down_y = 0
 mouse_up_x = 0
 mouse_up_y = 0
 
+# Event handlers. Each one takes the pygame event; event_handlers (below)
+# says which one to call for each event type, and key_handlers which one to
+# call for each key.
+def on_quit(event):
+    global run
+    run = False
+
+
+def on_expose(event):
+    # The window was uncovered or restored, and may need its pixels back
+    global dirty
+    dirty = True
+
+
+def on_mouse_down(event):
+    global mouse_down_x, mouse_down_y
+    # Get the pixel position of the mouse when clicked down
+    pos=pygame.mouse.get_pos()
+    mouse_down_x = pos[0]
+    mouse_down_y = pos[1]
+
+
+def on_mouse_up(event):
+    global mouse_up_x, mouse_up_y, real_min, real_max, imag_min, imag_max
+    global real_values, imag_values, px_arr, px_idx, max_itr, dirty, pending
+    if pending is not None:
+        # Still working on the last zoom
+        return
+    if event.button != 1:
+        # Only the left button zooms (pygame also sends mouse wheel
+        # ticks as button 4 and 5 clicks)
+        return
+    if event.pos[0] <= mouse_down_x:
+        # A click without a drag (or a drag to the left) has no box to zoom into
+        return
+    # After dragging to a new spot, get pixel position when
+    # button is let go
+    pos=event.pos
+    mouse_up_x = pos[0]
+    mouse_up_y = pos[1]
+    # CAREFUL! Here we assume that a box is drawn from top
+    # left to bottom right. The result is where we zoom in.
+    # The new bounds are worked out from the old ones (which are
+    # always float64) rather than read out of real_values and
+    # imag_values, which may only be float32.
+    dx = (real_max - real_min)/(num_x - 1)
+    dy = (imag_max - imag_min)/(num_y - 1)
+    real_min, real_max = real_min + mouse_down_x*dx, real_min + mouse_up_x*dx
+    imag_max = imag_max - mouse_down_y*dy
+    imag_min = imag_max - num_y*(real_max - real_min)/num_x
+    real_values, imag_values = plot_values()
+    # The box keeps the window's aspect ratio, so its height comes from its width
+    box_width = mouse_up_x - mouse_down_x
+    px_arr = zoom_preview(mouse_down_x, mouse_down_y, box_width, box_width*num_y//num_x)
+    px_idx = color_indices(px_arr, max_itr)
+    max_itr = iteration_budget()
+    dirty = True
+    print("recalculating...")
+    pending = BackgroundJob(calculate_mandelbrot, real_values, imag_values, max_itr)
+    print("mouse_down_x:", mouse_down_x, "   mouse_down_y:", mouse_down_y)
+    print("mouse_up_x:", mouse_up_x, "   mouse_up_y:", mouse_up_y)
+
+
+def on_key_c(event):
+    # press 'c' key to cycle through different color maps
+    global dirty
+    cmap.cycle_colormap()
+    if set_black:
+        cmap.colormap_array[cmap.number_colors - 1] = (0, 0, 0)
+        cmap.pack_lut_u32()
+    dirty = True
+    print("Colormap:", cmap.cmap_name)
+
+
+def on_key_b(event):
+    # press 'b' key to toggle whether the set is black, or determined by the colormap
+    global set_black, dirty
+    set_black = not set_black
+    if set_black:
+        cmap.colormap_array[cmap.number_colors - 1] = (0, 0, 0)
+    else:
+        cmap.colormap_array[cmap.number_colors - 1] = cmap.get_rgb_u8(cmap.max_value)
+    cmap.pack_lut_u32()
+    dirty = True
+
+
+key_handlers = {
+    pygame.K_c: on_key_c,
+    pygame.K_b: on_key_b,
+    pygame.K_ESCAPE: on_quit,
+}
+
+
+def on_key_down(event):
+    handler = key_handlers.get(event.key)
+    if handler is not None:
+        handler(event)
+
+
+event_handlers = {
+    pygame.QUIT: on_quit,
+    pygame.MOUSEBUTTONDOWN: on_mouse_down,
+    pygame.MOUSEBUTTONUP: on_mouse_up,
+    pygame.KEYDOWN: on_key_down,
+    pygame.VIDEOEXPOSE: on_expose,
+    pygame.WINDOWEXPOSED: on_expose,
+}
+
+
 run = True
 while run:
     for event in pygame.event.get():
-        if event.type == pygame.QUIT: 
-            run = False
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            # Get the pixel position of the mouse when clicked down
-            pos=pygame.mouse.get_pos()
-            mouse_down_x = pos[0]
-            mouse_down_y = pos[1]
-        if event.type == pygame.MOUSEBUTTONUP:
-            # After dragging to a new spot, get pixel position when
-            # button is let go
-            pos=event.pos
-            mouse_up_x = pos[0]
-            mouse_up_y = pos[1]
-            # CAREFUL! Here we assume that a box is drawn from top
-            # left to bottom right. The result is where we zoom in.
-            real_min = real_values[mouse_down_x]
-            real_max = real_values[mouse_up_x]
-            imag_max = imag_values[mouse_down_y]
-            imag_min = imag_max - num_y*(real_max - real_min)/num_x
-            real_values = np.linspace(real_min, real_max, num_x)
-            imag_values = np.linspace(imag_max, imag_min, num_y)
-            print("recalculating...")
-            calculate_mandelbrot()
-            print("mouse_down_x:", mouse_down_x, "   mouse_down_y:", mouse_down_y)
-            print("mouse_up_x:", mouse_up_x, "   mouse_up_y:", mouse_up_y)
-            print("Re = [", real_min, ",", real_max, "]")
-            print("Im = [", imag_min, ",", imag_max, "]")
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_c:                     # press 'c' key to cycle through 
-                cmap.cycle_colormap()                       # different color maps
-                if set_black:
-                    cmap.colormap_array[cmap.number_colors - 1] = (0, 0, 0)
-                print("Colormap:", cmap.cmap_name)
-            if event.key == pygame.K_b:                     # press 'b' key to toggle whether
-                set_black = not set_black                   # the set is black, or determined by the colormap
-                if set_black:
-                    cmap.colormap_array[cmap.number_colors - 1] = (0, 0, 0)
-                else:
-                    cmap.colormap_array[cmap.number_colors - 1] = cmap.get_rgb_u8(cmap.max_value)
-            if event.key == pygame.K_ESCAPE:
-                run = False
-
-
-    window.fill(0)
-
-    rect = pygame.Rect(window.get_rect().center, (0, 0)).inflate(*([min(window.get_size())//2]*2))
-
-    # This is the container for actual (r,g,b) pixel values, derived from values
-    # in px_arr. 
-    pixel_array = pygame.PixelArray(window)
-
-    for i in range(len(real_values)):
-        for j in range(len(imag_values)):
-            # px_arr is filled with the number of iterations for each point in the image
-            # for the i,jth pixel, find how many iterations it took (px_arr[i,j]) and pass
-            # that into colormap_array, which will return a (r,g,b) pixel value, which we
-            # assign to the i,jth pixel in pixel_array.
-            pixel_array[i,j] = cmap.colormap_array[int(px_arr[i,j])]
-
-
-    # Now it will be drawn to the screen
-    pixel_array.close()
-
-    pygame.display.flip()
+        handler = event_handlers.get(event.type)
+        if handler is not None:
+            handler(event)
+
+    if pending is not None and not pending.is_alive():
+        if pending.error is not None:
+            raise pending.error
+        px_arr = pending.result
+        px_idx = color_indices(px_arr, max_itr)
+        pending = None
+        dirty = True
+        # The bounds can't change while a job is pending, so these are
+        # the ones it was started with
+        print("done")
+        print("Re = [", real_min, ",", real_max, "]")
+        print("Im = [", imag_min, ",", imag_max, "]")
+
+    if dirty:
+        dirty = False
+        # px_idx holds the colormap index for each point in the image. Looking those
+        # up in cmap.lut_u32 gives the packed (r,g,b) pixel value for every point at
+        # once, which is copied straight into the window.
+        pygame.surfarray.blit_array(window, np.take(cmap.lut_u32, px_idx, mode='clip'))
+        if pending is not None:
+            window.blit(computing_text, (10, 10))
+        pygame.display.flip()
+
+    # Nothing else to do until the next event, so don't spin the CPU
+    clock.tick(60)
 
 pygame.quit()
 exit()